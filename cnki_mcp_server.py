@@ -4,6 +4,7 @@ CNKI MCP Server - CNKI academic paper search via MCP.
 Tools:
 - search_cnki: Search papers (with optional journal filter)
 - get_paper_detail: Get full paper metadata
+- get_paper_details: Get metadata for several papers in parallel
 - get_paper_bibtex: Get BibTeX citation entry for a paper
 - download_paper_pdf: Download paper PDF (requires institutional IP)
 - find_best_match: Find closest title match
@@ -17,15 +18,25 @@ from fastmcp import FastMCP, Context
 from fastmcp.dependencies import Depends, CurrentContext
 from typing import List, Optional, Annotated
 from pydantic import Field
-from playwright.async_api import async_playwright, Browser, Page, Playwright
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+import aiohttp
+import lxml.etree
+import lxml.html
+from yarl import URL
+from cachetools import TTLCache
+import orjson
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl
+from collections import Counter
 import asyncio
 import time
 import random
-import json
 import os
 import re
+import sys
+import unicodedata
 
 # =================== Search type mappings ===================
 
@@ -65,12 +76,34 @@ SORT_TYPE_ALIASES = {
     "composite": "综合", "general": "综合",
 }
 
+# Canonical names and aliases in one table, keyed by the lowercased input
+_SEARCH_TYPE_LOOKUP = {
+    **{k.lower(): k for k in SEARCH_TYPES},
+    **{k.lower(): v for k, v in SEARCH_TYPE_ALIASES.items()},
+}
+_SORT_TYPE_LOOKUP = {
+    **{k.lower(): k for k in SORT_TYPES},
+    **{k.lower(): v for k, v in SORT_TYPE_ALIASES.items()},
+}
+
 PROFESSIONAL_SEARCH_FIELDS = {
     "主题": "SU", "关键词": "KY", "篇名": "TI", "全文": "FT",
     "作者": "AU", "第一作者": "FI", "通讯作者": "RP",
     "作者单位": "AF", "摘要": "AB", "DOI": "DOI",
 }
 
+# kns8s AJAX endpoint behind the result table; returns the table HTML directly.
+CNKI_GRID_URL = "https://kns.cnki.net/kns8s/brief/grid"
+CNKI_RESULT_URL = "https://kns.cnki.net/kns8s/defaultresult/index"
+CNKI_KUAKU_CODE = "YSTT4HG0,LSTPFY1C,JUP3MUPD,MPMFIG1A,WQ0UVIAA,BLZOG7CK,PWFIRAGL,EMRPGLPA,NLBO1Z6R,NN3FJMUV"
+GRID_PAGE_SIZE = 20
+# Shown in place of the result table when a search matches nothing
+NO_RESULT_MARKERS = ("暂无数据", "共找到 0 条结果", "共找到0条结果")
+GRID_HEADERS = {
+    "Referer": CNKI_RESULT_URL, "Origin": "https://kns.cnki.net",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/535.19 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
@@ -78,6 +111,19 @@ USER_AGENTS = [
 ]
 
 
+# Type queries character by character instead of filling the input at once
+SLOW_TYPE = os.getenv("CNKI_MCP_SLOW_TYPE", "") == "1"
+
+# Multiplier for every random_delay; CNKI_MCP_FAST=1 drops the human-pacing delays
+DELAY_SCALE = float(os.getenv("CNKI_MCP_DELAY_SCALE", "0" if os.getenv("CNKI_MCP_FAST", "") == "1" else "1.0"))
+
+# Text CNKI serves instead of results when it rate-limits or wants a captcha
+THROTTLE_MARKERS = ("安全验证", "拼图完成验证", "访问过于频繁", "操作过于频繁")
+THROTTLE_BACKOFF = 60  # seconds of slowed-down pacing after a throttle page
+THROTTLE_MAX_FACTOR = 8.0
+THROTTLE_ERROR = "CNKI 返回了安全验证或限流页面，请稍后重试"
+
+
 # =================== Paper Registry ===================
 
 class PaperRegistry:
@@ -107,18 +153,71 @@ class PaperRegistry:
 paper_registry = PaperRegistry()
 
 
+# =================== Result cache ===================
+
+class ResultCache:
+    """In-process TTL LRU cache for tool results (search results and paper details)."""
+
+    MAX_SIZE = 512
+    TTL = 1800  # 30 min
+
+    def __init__(self, maxsize: int = MAX_SIZE, ttl: float = TTL):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: tuple) -> Optional[dict]:
+        """Return a copy of the cached result, or None on a miss."""
+        hit = self._cache.get(key)
+        return dict(hit) if hit is not None else None
+
+    def put(self, key: tuple, result: dict):
+        """Cache a result unless it is an error or only partially fetched."""
+        if not result.get("isError") and not result.get("incomplete"):
+            self._cache[key] = dict(result)
+
+
+result_cache = ResultCache()
+
+
 # =================== BrowserPool ===================
 
+# Nothing we scrape needs these; aborting them keeps page loads to the HTML + scripts.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_URL_PARTS = ("cnzz", "baidu-analytics", "hm.baidu")
+
+
+async def _block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(d in request.url for d in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 class BrowserPool:
-    """Manages a singleton Playwright browser with idle timeout."""
+    """Manages a singleton Playwright browser with idle timeout.
+
+    Pages are opened in a fixed set of pre-warmed browser contexts. Each
+    context is checked out for the lifetime of one page, so at most
+    ``max_contexts`` pages are open at once (CNKI_MCP_MAX_PAGES, default 4);
+    further callers queue in get_page until a page is closed. Cookies
+    picked up by one call are reused by the next.
+    """
 
     IDLE_TIMEOUT = 600  # 10 min
+    MAX_CONTEXTS = int(os.getenv("CNKI_MCP_MAX_PAGES", "4"))
 
-    def __init__(self):
+    def __init__(self, max_contexts: int = MAX_CONTEXTS):
+        # asyncio.Queue(maxsize=0) is unbounded and no contexts would be created,
+        # leaving every get_page blocked forever
+        if max_contexts < 1:
+            raise ValueError(f"max_contexts (CNKI_MCP_MAX_PAGES) must be >= 1, got {max_contexts}")
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._last_used: float = 0
         self._lock = asyncio.Lock()
+        self._launch_task: Optional[asyncio.Task] = None
+        self.max_contexts = max_contexts
+        self._ctx_pool: asyncio.Queue[BrowserContext] = asyncio.Queue(maxsize=max_contexts)
 
     async def _create_browser(self) -> Browser:
         if self._playwright is None:
@@ -144,28 +243,102 @@ class BrowserPool:
         except Exception:
             return False
 
-    async def get_page(self) -> Page:
-        """Get a new page from the browser (caller must close it)."""
+    async def _create_context(self, browser: Browser) -> BrowserContext:
+        context = await browser.new_context(
+            user_agent=random.choice(USER_AGENTS),
+            java_script_enabled=True,
+        )
+        await context.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+        """)
+        await context.route("**/*", _block_heavy_resources)
+        return context
+
+    async def _launch(self) -> Browser:
+        """Start the browser and fill the context pool."""
+        browser = await self._create_browser()
+        try:
+            contexts = await asyncio.gather(*(self._create_context(browser) for _ in range(self.max_contexts)))
+        except BaseException:
+            # Not stored on self yet, so nothing else would ever close it
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            raise
+        for context in contexts:
+            self._ctx_pool.put_nowait(context)
+        return browser
+
+    async def _await_launch(self, task: asyncio.Task):
+        # shield: a cancelled caller must not cancel the launch other callers are waiting on
+        try:
+            browser = await asyncio.shield(task)
+        except Exception:
+            if self._launch_task is task:
+                self._launch_task = None
+            raise
+        if self._launch_task is task:
+            self._browser = browser
+            self._launch_task = None
+
+    async def get_page(self) -> "PooledPage":
+        """Get a new page from a pooled context (caller must close it)."""
+        # Only state checks happen under the lock; the ~1s Chromium launch runs
+        # as a task that every concurrent first caller awaits together.
         async with self._lock:
             now = time.time()
             if self._browser is not None:
                 if now - self._last_used > self.IDLE_TIMEOUT:
                     await self._close_internal()
                 elif not await self._is_browser_alive():
+                    # is_connected() is a local flag, so checking on every call is free
                     self._browser = None
-            if self._browser is None:
-                self._browser = await self._create_browser()
+                    self._drain_contexts()
+            if self._browser is None and self._launch_task is None:
+                self._launch_task = asyncio.create_task(self._launch())
+            launch_task = self._launch_task
             self._last_used = now
 
-        page = await self._browser.new_page(
-            user_agent=random.choice(USER_AGENTS),
-        )
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-        """)
-        return page
+        if launch_task is not None:
+            await self._await_launch(launch_task)
+
+        context = await self._ctx_pool.get()
+        try:
+            return PooledPage(await context.new_page(), self)
+        except BaseException:
+            # BaseException: a cancelled call must still give its context back,
+            # or the pool shrinks until every get_page blocks forever
+            await self._return_context(context)
+            raise
+
+    async def release_page(self, page: Page):
+        """Close a page and hand its context back to the pool (PooledPage.close calls this)."""
+        context = page.context
+        try:
+            await page.close()
+        except Exception:
+            pass
+        finally:
+            await self._return_context(context)
+
+    async def _return_context(self, context: BrowserContext):
+        # Contexts from a browser that has since been replaced are discarded;
+        # the new browser was given a full set of its own.
+        if self._browser is not None and context.browser is self._browser:
+            self._ctx_pool.put_nowait(context)
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    def _drain_contexts(self):
+        while not self._ctx_pool.empty():
+            self._ctx_pool.get_nowait()
 
     async def _close_internal(self):
+        self._drain_contexts()
         if self._browser is not None:
             try:
                 await self._browser.close()
@@ -175,6 +348,11 @@ class BrowserPool:
 
     async def close(self):
         async with self._lock:
+            if self._launch_task is not None:
+                try:
+                    await self._await_launch(self._launch_task)
+                except Exception:
+                    pass
             await self._close_internal()
         if self._playwright is not None:
             try:
@@ -184,48 +362,103 @@ class BrowserPool:
             self._playwright = None
 
 
+class PooledPage:
+    """A Page checked out of a BrowserPool.
+
+    Behaves like the wrapped Page, except that close() also returns its
+    context to the pool. Closing twice is a no-op.
+    """
+
+    def __init__(self, page: Page, pool: BrowserPool):
+        self._page = page
+        self._pool = pool
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await self._pool.release_page(self._page)
+
+
 # =================== Helpers ===================
 
 def resolve_search_type(search_type: str) -> str:
-    if not search_type:
-        return "主题"
-    s = search_type.lower().strip()
-    if s in SEARCH_TYPE_ALIASES:
-        return SEARCH_TYPE_ALIASES[s]
-    if search_type in SEARCH_TYPES:
-        return search_type
-    return "主题"
+    return _SEARCH_TYPE_LOOKUP.get((search_type or "").strip().lower(), "主题")
 
 
 def resolve_sort_type(sort_type: str) -> str:
-    if not sort_type:
-        return "相关度"
-    s = sort_type.lower().strip()
-    if s in SORT_TYPE_ALIASES:
-        return SORT_TYPE_ALIASES[s]
-    if sort_type in SORT_TYPES:
-        return sort_type
-    return "相关度"
+    return _SORT_TYPE_LOOKUP.get((sort_type or "").strip().lower(), "相关度")
+
+
+def normalize_query(text: Optional[str]) -> str:
+    """Normalize user input for cache keys (full-width → half-width, case-folded)."""
+    return unicodedata.normalize("NFKC", text or "").strip().lower()
 
 
 def find_closest_title(title: str, result_titles: List[str]) -> int:
-    max_similar = 0
-    best_index = 0
-    for i, t in enumerate(result_titles):
-        common_chars = sum(c in t for c in title)
-        if common_chars > max_similar:
-            max_similar = common_chars
-            best_index = i
-    return best_index
+    """Index of the title sharing the most characters with `title` (multiset overlap)."""
+    if not result_titles:
+        return 0
+    query = Counter(title)
+    return max(range(len(result_titles)),
+               key=lambda i: sum((query & Counter(result_titles[i])).values()))
+
+
+_delay_scale: float = DELAY_SCALE
+_throttle_factor: float = 1.0
+_throttle_until: float = 0
+
+
+def set_delay_scale(scale: float):
+    """Override the base random_delay multiplier (0 disables delays)."""
+    global _delay_scale
+    _delay_scale = scale
+
+
+def note_throttle(text: str) -> bool:
+    """Back off if `text` is a CNKI rate-limit / captcha page.
+
+    Each hit within the backoff window doubles the delay factor (capped at
+    THROTTLE_MAX_FACTOR); delays are always at least normal pacing while
+    throttled, even when CNKI_MCP_FAST is set.
+    """
+    global _throttle_factor, _throttle_until
+    if not any(marker in text for marker in THROTTLE_MARKERS):
+        return False
+    now = time.time()
+    _throttle_factor = min(_throttle_factor * 2, THROTTLE_MAX_FACTOR) if now < _throttle_until else 2.0
+    _throttle_until = now + THROTTLE_BACKOFF
+    return True
+
+
+def current_delay_scale() -> float:
+    if time.time() < _throttle_until:
+        return max(_delay_scale, 1.0) * _throttle_factor
+    return _delay_scale
 
 
 async def random_delay(lo: float = 1.0, hi: float = 2.5):
-    await asyncio.sleep(random.uniform(lo, hi))
+    scale = current_delay_scale()
+    if scale > 0:
+        await asyncio.sleep(random.uniform(lo, hi) * scale)
 
 
-async def type_slowly(page: Page, selector: str, text: str):
-    """Type text character by character to mimic human input."""
+async def type_slowly(page: Page, selector: str, text: str, slow: bool = SLOW_TYPE):
+    """Enter text into an input.
+
+    CNKI's search box does not react to individual keystrokes, so the text
+    is filled in one go. Pass slow=True (or set CNKI_MCP_SLOW_TYPE=1) to
+    type character by character if anti-bot checks start firing.
+    """
     locator = page.locator(selector)
+    if not slow:
+        await locator.fill(text)
+        await random_delay(0.1, 0.3)
+        return
     await locator.clear()
     for char in text:
         await locator.press_sequentially(char, delay=random.uniform(30, 80))
@@ -233,116 +466,346 @@ async def type_slowly(page: Page, selector: str, text: str):
 
 # =================== Search implementations ===================
 
-async def _parse_paper_row(row) -> dict:
-    """Parse a search result table row into a paper dict."""
-    paper = {}
-    try:
-        title_el = await row.query_selector('a.fz14')
-        paper["title"] = (await title_el.inner_text()).strip() if title_el else ""
-        paper["url"] = (await title_el.get_attribute("href")) if title_el else ""
-    except Exception:
-        paper["title"] = ""
-        paper["url"] = ""
-    try:
-        authors = await row.query_selector_all('td.author a')
-        paper["authors"] = [(await a.inner_text()).strip() for a in authors if (await a.inner_text()).strip()]
-    except Exception:
-        paper["authors"] = []
-    try:
-        source_el = await row.query_selector('td.source a')
-        paper["source"] = (await source_el.inner_text()).strip() if source_el else ""
-    except Exception:
-        paper["source"] = ""
-    try:
-        date_el = await row.query_selector('td.date')
-        paper["date"] = (await date_el.inner_text()).strip() if date_el else ""
-    except Exception:
-        paper["date"] = ""
-    try:
-        cite_el = await row.query_selector('td.quote a')
-        paper["cited_count"] = (await cite_el.inner_text()).strip() if cite_el else "0"
-    except Exception:
-        paper["cited_count"] = "0"
-    try:
-        dl_el = await row.query_selector('td.download a')
-        paper["download_count"] = (await dl_el.inner_text()).strip() if dl_el else "0"
-    except Exception:
-        paper["download_count"] = "0"
+# Runs in the browser; one call serializes a whole result row.
+ROW_EXTRACTOR_JS = """
+(el) => {
+    const text = (sel, dflt = '') => {
+        const node = el.querySelector(sel);
+        return node ? node.innerText.trim() : dflt;
+    };
+    const link = el.querySelector('a.fz14');
+    return {
+        title: link ? link.innerText.trim() : '',
+        url: link ? (link.getAttribute('href') || '') : '',
+        authors: [...el.querySelectorAll('td.author a')].map(a => a.innerText.trim()).filter(Boolean),
+        source: text('td.source a'),
+        date: text('td.date'),
+        cited_count: text('td.quote a', '0'),
+        download_count: text('td.download a', '0'),
+    };
+}
+"""
+
+TABLE_EXTRACTOR_JS = f"(rows) => rows.map({ROW_EXTRACTOR_JS.strip()})"
+
+RESULT_ROWS_SELECTOR = 'table.result-table-list tbody tr'
+PAGER_SELECTOR = '.countPageMark, .pagerTitleCell'
+
+
+def _register_paper(paper: dict, page_num: int) -> dict:
+    """Register a parsed paper and replace its URL with a label."""
+    paper["page"] = page_num
+    first_author = paper["authors"][0] if paper.get("authors") else ""
+    year = paper.get("date", "")[:4]
+    paper["label"] = paper_registry.register(paper["url"], first_author, year, paper["title"])
+    del paper["url"]
     return paper
 
 
-async def _collect_results(page: Page, pages: int) -> list:
-    """Collect paper results across multiple pages."""
-    all_papers = []
-    for page_num in range(1, pages + 1):
-        try:
-            rows = await page.query_selector_all('table.result-table-list tbody tr')
-            if not rows:
-                await page.wait_for_selector('table.result-table-list tbody tr', timeout=15000)
-                rows = await page.query_selector_all('table.result-table-list tbody tr')
-            for row in rows:
-                paper = await _parse_paper_row(row)
-                if paper["title"]:
-                    paper["page"] = page_num
-                    # Register paper and replace URL with label
-                    first_author = paper["authors"][0] if paper.get("authors") else ""
-                    year = paper.get("date", "")[:4]
-                    label = paper_registry.register(paper["url"], first_author, year, paper["title"])
-                    paper["label"] = label
-                    del paper["url"]
-                    all_papers.append(paper)
-        except Exception:
-            pass
+def _track_grid_requests(page: Page) -> list:
+    """Record the kns8s/brief/grid requests a page sends (latest last)."""
+    requests = []
+    page.on("request", lambda r: requests.append(r) if "/brief/grid" in r.url else None)
+    return requests
 
-        if page_num < pages:
-            try:
-                next_btn = await page.query_selector("#PageNext")
-                if next_btn and await next_btn.is_enabled():
-                    await next_btn.click()
-                    await random_delay(1.5, 2.5)
-                else:
-                    break
-            except Exception:
-                break
-    return all_papers
 
+async def _collect_results(page: Page, pages: int, grid_requests: list, http: aiohttp.ClientSession) -> tuple[list, bool]:
+    """Collect paper results across multiple pages.
 
-async def _simple_search(page: Page, query: str, search_type: str, sort: str, pages: int) -> dict:
+    Page 1 is read from the live DOM. Later pages are fetched concurrently
+    by replaying the page's own grid request over HTTP with the browser's
+    cookies, rather than clicking through #PageNext one page at a time.
+
+    Returns (papers, complete); complete is False if a later page could not
+    be fetched, including when no grid request was captured to replay. Raises if page 1 is neither a result table nor CNKI's
+    "no results" message, so a captcha is never reported as an empty search.
+    """
+    rows = await page.eval_on_selector_all(RESULT_ROWS_SELECTOR, TABLE_EXTRACTOR_JS)
+    if not rows:
+        content = await page.content()
+        if note_throttle(content):
+            raise RuntimeError(THROTTLE_ERROR)
+        if not _is_no_result_page(content):
+            raise RuntimeError("未能加载 CNKI 检索结果表")
+        return [], True
+    all_papers = [_register_paper(p, 1) for p in rows if p["title"]]
+    if pages == 1 or not all_papers:
+        return all_papers, True
+
+    grid_request = grid_requests[-1] if grid_requests else None
+    base_form = dict(parse_qsl(grid_request.post_data or "", keep_blank_values=True)) if grid_request else {}
+    page_size = int(base_form.get("pageSize") or GRID_PAGE_SIZE)
+    if len(rows) < page_size:
+        return all_papers, True  # a short first page is also the last
+    pager = await page.eval_on_selector_all(PAGER_SELECTOR, "els => els.map(e => e.outerHTML).join(' ')")
+    last_page = min(pages, _grid_page_count(pager, page_size) or pages)
+    if last_page == 1:
+        return all_papers, True
+    if grid_request is None:
+        return all_papers, False  # more pages exist, but there is no request to replay
+
+    headers = {"User-Agent": grid_request.headers.get("user-agent", random.choice(USER_AGENTS))}
+    try:
+        cookies = {c["name"]: c["value"] for c in await page.context.cookies(CNKI_GRID_URL)}
+        # Share the connection pool but not the cookie jar: Set-Cookie answers to the
+        # browser's session must not leak into the shared HTTP search session
+        async with aiohttp.ClientSession(
+            connector=http.connector, connector_owner=False,
+            cookie_jar=aiohttp.DummyCookieJar(), timeout=http.timeout,
+        ) as replay:
+            more, complete = await _fetch_remaining_pages(replay, base_form, last_page, headers=headers, cookies=cookies)
+    except (PlaywrightError, aiohttp.ClientError, asyncio.TimeoutError):
+        return all_papers, False
+    return all_papers + more, complete
+
+
+async def _wait_for_results(page: Page, timeout: float = 15000):
+    """Wait until the result table has rows; returns quietly on timeout (no results or blocked)."""
+    try:
+        await page.wait_for_selector(RESULT_ROWS_SELECTOR, timeout=timeout, state="attached")
+    except PlaywrightTimeoutError:
+        pass
+
+
+async def _apply_sort(page: Page, resolved_sort: str):
+    """Click a sort tab and wait for the re-sorted grid to be rendered."""
+    if resolved_sort == "相关度":
+        return
+    sort_id = SORT_TYPES.get(resolved_sort)
+    if not sort_id:
+        return
+    try:
+        # The old rows stay attached until the new grid arrives, so wait on the response itself
+        async with page.expect_response(lambda r: "/brief/grid" in r.url, timeout=15000):
+            await page.click(f"#{sort_id}", timeout=10000)
+        await _wait_for_results(page)
+    except Exception:
+        pass
+
+
+async def _simple_search(page: Page, http: aiohttp.ClientSession, query: str, search_type: str, sort: str, pages: int) -> dict:
     """Search via CNKI homepage (no journal filter)."""
     resolved_type = resolve_search_type(search_type)
     resolved_sort = resolve_sort_type(sort)
 
-    await page.goto("https://www.cnki.net/")
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
     await random_delay(1, 2)
 
     if resolved_type != "主题":
         value = SEARCH_TYPE_VALUES.get(resolved_type)
         if value:
             await page.click("#DBFieldBox")
-            await asyncio.sleep(0.8)
             await page.click(f'#DBFieldList a[value="{value}"]')
-            await asyncio.sleep(0.5)
 
     await type_slowly(page, "#txt_SearchText", query)
+    grid_requests = _track_grid_requests(page)
     await page.click(".search-btn")
-    await random_delay(2, 3)
+    await _wait_for_results(page)
+    await _apply_sort(page, resolved_sort)
 
-    if resolved_sort != "相关度":
-        sort_id = SORT_TYPES.get(resolved_sort)
-        if sort_id:
-            try:
-                await page.click(f"#{sort_id}", timeout=10000)
-                await random_delay(1.5, 2.5)
-                await page.wait_for_selector('table.result-table-list tbody tr', timeout=15000)
-            except Exception:
-                pass
+    all_papers, complete = await _collect_results(page, pages, grid_requests, http)
+
+    result = {
+        "query": query, "search_type": resolved_type, "sort": resolved_sort,
+        "total_pages": pages, "total_papers": len(all_papers), "papers": all_papers,
+    }
+    if not complete:
+        result["incomplete"] = True
+    return result
+
+
+def _parse_paper_tr(tr) -> dict:
+    """Parse an lxml result table row into a paper dict (same shape as ROW_EXTRACTOR_JS)."""
+    def first_text(xpath: str, default: str = "") -> str:
+        found = tr.xpath(xpath)
+        return found[0].text_content().strip() if found else default
+
+    title_links = tr.xpath("./td[contains(@class, 'name')]//a[contains(@class, 'fz14')]")
+    return {
+        "title": title_links[0].text_content().strip() if title_links else "",
+        "url": title_links[0].get("href", "") if title_links else "",
+        "authors": [t for t in (a.text_content().strip() for a in tr.xpath("./td[contains(@class, 'author')]//a")) if t],
+        "source": first_text("./td[contains(@class, 'source')]//a"),
+        "date": first_text("./td[contains(@class, 'date')]"),
+        "cited_count": first_text("./td[contains(@class, 'quote')]//a", "0"),
+        "download_count": first_text("./td[contains(@class, 'download')]//a", "0"),
+    }
+
+
+_PAGE_MARK_RE = re.compile(r'countPageMark[^>]*>\s*\d+\s*/\s*(\d+)')
+_TOTAL_COUNT_RE = re.compile(r'共找到\D{0,40}?([\d,]+)\D{0,40}?条结果')
+
+
+def _is_no_result_page(html: str) -> bool:
+    """Whether CNKI's "no results" message is on the page."""
+    return any(marker in html for marker in NO_RESULT_MARKERS)
+
+
+def _grid_page_count(html: str, page_size: int = GRID_PAGE_SIZE) -> Optional[int]:
+    """Number of result pages reported by a grid's pager, or None if it has no pager.
+
+    Prefers the "1/62" page mark and falls back to "共找到 1,234 条结果".
+    """
+    match = _PAGE_MARK_RE.search(html)
+    if match:
+        return int(match.group(1))
+    match = _TOTAL_COUNT_RE.search(html)
+    if match:
+        return -(-int(match.group(1).replace(",", "")) // page_size)
+    return None
+
+
+def _parse_grid_html(body: str) -> Optional[list]:
+    """Parse a kns8s/brief/grid response into paper dicts.
+
+    Returns [] only when CNKI explicitly reports no results, and None when
+    there are no data rows otherwise (captcha, login wall or other JS-gated
+    state), so callers can fall back to Playwright.
+    """
+    if not body.strip():
+        return None
+    try:
+        doc = lxml.html.fromstring(body)
+    except (lxml.etree.ParserError, ValueError):
+        # e.g. "Document is empty" for markup-free bodies, or an XML encoding declaration
+        return None
+    # lxml does not insert the implicit <tbody> a browser would, so don't rely on it
+    rows = doc.xpath("//table[contains(@class, 'result-table-list')]//tr[td]")
+    if not rows:
+        return [] if _is_no_result_page(body) else None
+    return [p for p in (_parse_paper_tr(tr) for tr in rows) if p["title"]]
+
+
+def _build_query_json(field_code: str, operator: str, value: str, title: str = "") -> str:
+    """Build the QueryJson payload expected by kns8s/brief/grid."""
+    query = {
+        "Platform": "", "Resource": "CROSSDB", "Classid": "WD0FTY92", "Products": "",
+        "QNode": {"QGroup": [{
+            "Key": "Subject", "Title": "", "Logic": 0,
+            "Items": [{"Field": field_code, "Value": value, "Operator": operator, "Logic": 0, "Title": title}],
+            "ChildItems": [],
+        }]},
+        "ExScope": "1", "SearchType": 2, "Rlang": "CHINESE",
+        "KuaKuCode": CNKI_KUAKU_CODE, "SearchFrom": 1,
+    }
+    return orjson.dumps(query).decode()
 
-    all_papers = await _collect_results(page, pages)
 
+def _build_grid_form(query_json: str, sort_id: str) -> dict:
+    """Build the form fields for a kns8s/brief/grid POST (page number added per request)."""
     return {
+        "QueryJson": query_json, "pageSize": str(GRID_PAGE_SIZE),
+        "sortField": sort_id, "sortType": "desc" if sort_id else "",
+        "dstyle": "listmode", "boolSortSearch": "true" if sort_id else "false",
+        "productStr": CNKI_KUAKU_CODE, "aside": "",
+        "searchFrom": "资源范围：总库",
+    }
+
+
+async def _fetch_grid_page(session: aiohttp.ClientSession, base_form: dict, page_num: int,
+                           headers: Optional[dict] = None, cookies: Optional[dict] = None) -> tuple[Optional[list], Optional[int]]:
+    """POST one result page to kns8s/brief/grid and parse it.
+
+    Returns (papers, page_count): papers as from _parse_grid_html, and the
+    number of result pages CNKI reports (None if unknown). headers/cookies are sent on top of the session's own, e.g. to replay a
+    browser page's grid request with that page's user agent and cookies.
+    """
+    form = {
+        **base_form,
+        "boolSearch": "true" if page_num == 1 else "false",
+        "pageNum": str(page_num), "CurPage": str(page_num),
+    }
+    async with session.post(CNKI_GRID_URL, data=form, headers={**GRID_HEADERS, **(headers or {})}, cookies=cookies) as resp:
+        resp.raise_for_status()
+        try:
+            body = await resp.text()
+        except (UnicodeDecodeError, LookupError):
+            # Undecodable or unknown charset: not a grid page, let the caller fall back
+            return None, None
+    papers = _parse_grid_html(body)
+    if papers is None:
+        note_throttle(body)
+    return papers, _grid_page_count(body, int(base_form.get("pageSize") or GRID_PAGE_SIZE))
+
+
+async def _page_jitter(page_num: int, pages: int):
+    """Stagger concurrent page fetches so CNKI does not see a burst.
+
+    Unlike random_delay this never drops below normal pacing: CNKI_MCP_FAST
+    removes human-like pauses, not the anti-burst stagger.
+    """
+    lo, hi = (0.1, 0.5) if pages < 4 else (0.5 * page_num, 0.5 * page_num + 1)
+    await asyncio.sleep(random.uniform(lo, hi) * max(current_delay_scale(), 1.0))
+
+
+async def _fetch_remaining_pages(session: aiohttp.ClientSession, base_form: dict, last_page: int,
+                                 headers: Optional[dict] = None, cookies: Optional[dict] = None) -> tuple[list, bool]:
+    """Fetch result pages 2..last_page concurrently; stops after the first short page.
+
+    Callers cap last_page to the page count CNKI reports, so no request
+    goes past the end of the results (CNKI may clamp CurPage and repeat
+    the last page). Returns (papers, complete); complete is False if a page
+    failed or came back without a result table (e.g. throttled), as opposed
+    to running out of results.
+    """
+    page_size = int(base_form.get("pageSize") or GRID_PAGE_SIZE)
+
+    async def fetch(page_num: int) -> Optional[list]:
+        await _page_jitter(page_num, last_page)
+        papers, _ = await _fetch_grid_page(session, base_form, page_num, headers=headers, cookies=cookies)
+        return papers
+
+    results = await asyncio.gather(*(fetch(k) for k in range(2, last_page + 1)), return_exceptions=True)
+    all_papers = []
+    for page_num, papers in enumerate(results, start=2):
+        if isinstance(papers, BaseException) or papers is None:
+            return all_papers, False
+        all_papers.extend(_register_paper(p, page_num) for p in papers)
+        if len(papers) < page_size:
+            break
+    return all_papers, True
+
+
+async def _simple_search_http(session: aiohttp.ClientSession, query: str, search_type: str, sort: str, pages: int) -> Optional[dict]:
+    """Search via CNKI's result grid endpoint without a browser.
+
+    Returns None if CNKI answers with anything other than a result table,
+    in which case the caller should retry through _simple_search.
+    """
+    resolved_type = resolve_search_type(search_type)
+    resolved_sort = resolve_sort_type(sort)
+
+    # e.g. "SU$%=|" → field "SU", "%" marks a fuzzy field
+    field_code, _, flags = SEARCH_TYPE_VALUES[resolved_type].partition("$")
+    operator = "TOPRANK" if field_code == "SU" else ("FUZZY" if "%" in flags else "DEFAULT")
+    query_json = _build_query_json(field_code, operator, query, resolved_type)
+    sort_id = SORT_TYPES.get(resolved_sort, "") if resolved_sort != "相关度" else ""
+
+    # Result page sets the session cookies the grid endpoint expects; the
+    # shared session keeps them, so this only happens on the first search
+    if not session.cookie_jar.filter_cookies(URL(CNKI_RESULT_URL)):
+        async with session.get(CNKI_RESULT_URL) as resp:
+            await resp.read()
+
+    base_form = _build_grid_form(query_json, sort_id)
+    papers, page_count = await _fetch_grid_page(session, base_form, 1)
+    if papers is None:
+        return None
+    all_papers = [_register_paper(p, 1) for p in papers]
+    complete = True
+    last_page = min(pages, page_count or pages)
+    # A short first page is also the last one
+    if last_page > 1 and len(papers) >= GRID_PAGE_SIZE:
+        more, complete = await _fetch_remaining_pages(session, base_form, last_page)
+        all_papers.extend(more)
+
+    result = {
         "query": query, "search_type": resolved_type, "sort": resolved_sort,
         "total_pages": pages, "total_papers": len(all_papers), "papers": all_papers,
     }
+    if not complete:
+        result["incomplete"] = True
+    return result
 
 
 def _build_field_expr(field_code: str, query: str) -> str:
@@ -366,7 +829,7 @@ def _build_field_expr(field_code: str, query: str) -> str:
         return f"{field_code}={parts}"
 
 
-async def _professional_search(page: Page, query: str, search_type: str, journal: Optional[str], sort: str, pages: int, author: Optional[str] = None) -> dict:
+async def _professional_search(page: Page, http: aiohttp.ClientSession, query: str, search_type: str, journal: Optional[str], sort: str, pages: int, author: Optional[str] = None) -> dict:
     """Search via CNKI Professional Search (with journal/author filter).
 
     Journal names use exact match (LY=), topics use fuzzy match (SU%),
@@ -396,41 +859,32 @@ async def _professional_search(page: Page, query: str, search_type: str, journal
         expr += f" AND {journal_expr}"
 
     # Visit main site first for session cookies
-    await page.goto("https://www.cnki.net/")
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
     await random_delay(1, 2)
 
-    await page.goto("https://kns.cnki.net/kns8s/AdvSearch")
-    await random_delay(1, 2)
+    await page.goto("https://kns.cnki.net/kns8s/AdvSearch", wait_until="domcontentloaded")
 
-    # Click Professional Search tab
+    # Click Professional Search tab (click/fill auto-wait for their targets)
     await page.click('li[name="majorSearch"]')
-    await random_delay(0.5, 1)
 
     # Enter expression
     await page.locator("textarea.majorSearch").fill(expr)
-    await random_delay(0.3, 0.5)
 
     # Click search
+    grid_requests = _track_grid_requests(page)
     await page.click("input.btn-search")
-    await random_delay(2, 3)
-
-    if resolved_sort != "相关度":
-        sort_id = SORT_TYPES.get(resolved_sort)
-        if sort_id:
-            try:
-                await page.click(f"#{sort_id}", timeout=10000)
-                await random_delay(1.5, 2.5)
-                await page.wait_for_selector('table.result-table-list tbody tr', timeout=15000)
-            except Exception:
-                pass
+    await _wait_for_results(page)
+    await _apply_sort(page, resolved_sort)
 
-    all_papers = await _collect_results(page, pages)
+    all_papers, complete = await _collect_results(page, pages, grid_requests, http)
 
     result = {
         "query": query, "search_type": resolved_type,
         "sort": resolved_sort, "expression": expr,
         "total_pages": pages, "total_papers": len(all_papers), "papers": all_papers,
     }
+    if not complete:
+        result["incomplete"] = True
     if author:
         result["author"] = author
     if journal:
@@ -440,6 +894,76 @@ async def _professional_search(page: Page, query: str, search_type: str, journal
 
 # =================== Paper detail ===================
 
+# Top-tip issue info, e.g. "2026 (02)", "2024,40(05):1-15", "2024 ,40 (05) :1-15"
+_INFO_RE = re.compile(
+    r'^\s*(?P<year>\d{4})\s*(?:,\s*(?P<volume>\d+))?\s*'
+    r'\(\s*(?P<issue>\d+)\s*\)\s*(?::\s*(?P<pages>.+?))?\s*$'
+)
+_LIST_SEP_RE = re.compile(r'[,，;；]')
+_AUTHOR_INDEX_RE = re.compile(r'^\d*\.')  # footnote-only entries like "1." in author links
+_LEADING_INDEX_RE = re.compile(r'^\d+\.')
+_POSTCODE_RE = re.compile(r'\s*\d{6}\s*$')
+
+# Runs in the browser and returns every raw field of a detail page in one
+# roundtrip; cleanup that needs regexes happens in _get_paper_detail.
+DETAIL_EXTRACTOR_JS = """
+() => {
+    const all = (sel) => [...document.querySelectorAll(sel)];
+    const text = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? el.innerText.trim() : '';
+    };
+    const texts = (sel) => all(sel).map(el => el.innerText.trim()).filter(Boolean);
+    // :has-text matching: case-insensitive, whitespace-normalized substring
+    const norm = (s) => s.replace(/\\s+/g, ' ').trim().toLowerCase();
+    const hasText = (el, label) => norm(el.textContent).includes(norm(label));
+    // Equivalent of Playwright's `${sel}:has-text("${label}") ${child}`: the first
+    // child under any matching element, not just under the first match
+    const labelled = (sel, label, child) => {
+        for (const el of all(sel)) {
+            const target = hasText(el, label) && el.querySelector(child);
+            if (target) return target.innerText.trim();
+        }
+        return '';
+    };
+    // div.total-inform span:has-text(label) + em
+    const counter = (label) => {
+        for (const span of all('div.total-inform span')) {
+            const em = span.nextElementSibling;
+            if (em && em.matches('em') && hasText(span, label)) return em.innerText.trim();
+        }
+        return '';
+    };
+    const withoutSup = (el) => {
+        const copy = el.cloneNode(true);
+        copy.querySelectorAll('sup').forEach(s => s.remove());
+        return copy.textContent.trim();
+    };
+    let instLinks = all('h3.author:not(#authorpart) a');
+    if (!instLinks.length) instLinks = all('h3.orgn span a');
+    return {
+        title: text('div.wx-tit h1') || text('h1'),
+        title_en: text('div.wx-tit h2'),
+        author_links: all('h3#authorpart a').map(withoutSup),
+        author_text: text('h3#authorpart'),
+        institution_links: instLinks.map(a => a.innerText.trim()).filter(Boolean),
+        institution_text: texts('h3.author:not(#authorpart)'),
+        abstract: text('#ChDivSummary'),
+        abstract_en: text('#EnChDivSummary'),
+        keywords: texts('p.keywords a'),
+        source: text('div.top-tip a[href*="navi.cnki.net"]'),
+        top_tip: all('div.top-tip a').map(a => a.innerText.trim()),
+        doc_spans: texts('.doc span'),
+        doi: labelled('li.top-space', 'DOI', 'p'),
+        cited_count: text('#refs a') || counter('被引'),
+        download_count: text('#DownLoadParts a') || counter('下载'),
+        fund: labelled('li.top-space', '基金', 'p') || text('p.funds span'),
+        classification: labelled('li', '分类号', 'p'),
+    };
+}
+"""
+
+
 async def _get_paper_detail(page: Page, url: str) -> dict:
     """Navigate to a CNKI paper detail page and extract metadata."""
     paper = {
@@ -451,114 +975,68 @@ async def _get_paper_detail(page: Page, url: str) -> dict:
     }
 
     # Establish session and set referer to avoid captcha
-    await page.goto("https://www.cnki.net/")
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
     await random_delay(1, 2)
     await page.set_extra_http_headers({"Referer": "https://kns.cnki.net/kns8s/AdvSearch"})
-    await page.goto(url)
+    await page.goto(url, wait_until="domcontentloaded")
     await random_delay(1.5, 2.5)
 
-    async def text(selector: str, default: str = "") -> str:
-        el = await page.query_selector(selector)
-        return (await el.inner_text()).strip() if el else default
-
-    async def texts(selector: str) -> List[str]:
-        els = await page.query_selector_all(selector)
-        result = []
-        for el in els:
-            t = (await el.inner_text()).strip()
-            if t:
-                result.append(t)
-        return result
-
-    paper["title"] = await text('div.wx-tit h1') or await text('h1')
-    paper["title_en"] = await text('div.wx-tit h2')
+    data = await page.evaluate(DETAIL_EXTRACTOR_JS)
+    if not data["title"] and note_throttle(await page.content()):
+        raise RuntimeError(THROTTLE_ERROR)
+    for key in ("title", "title_en", "abstract", "abstract_en", "doi",
+                "cited_count", "download_count", "fund", "classification"):
+        paper[key] = data[key]
 
     # Authors: modern papers have <a> links in h3#authorpart; older papers have plain text
-    author_links = await page.query_selector_all('h3#authorpart a')
-    if author_links:
-        for link in author_links:
-            name = await link.evaluate(
-                '(el) => { el.querySelectorAll("sup").forEach(s => s.remove()); return el.textContent.trim(); }'
-            )
-            if name and not re.match(r'^\d*\.', name):
-                paper["authors"].append(name)
-    else:
+    if data["author_links"]:
+        paper["authors"] = [name for name in data["author_links"] if name and not _AUTHOR_INDEX_RE.match(name)]
+    elif data["author_text"]:
         # Older papers: plain text, comma-separated in h3#authorpart span
-        author_text = await text('h3#authorpart')
-        if author_text:
-            paper["authors"] = [a.strip() for a in re.split(r'[,，;；]', author_text) if a.strip()]
+        paper["authors"] = [a.strip() for a in _LIST_SEP_RE.split(data["author_text"]) if a.strip()]
 
     # Institutions: modern papers use h3.author:not(#authorpart) with <a> links
     # Older papers use the second h3.author as plain comma-separated text
-    inst_links = await page.query_selector_all('h3.author:not(#authorpart) a')
-    if not inst_links:
-        inst_links = await page.query_selector_all('h3.orgn span a')
-    if inst_links:
-        for link in inst_links:
-            t = (await link.inner_text()).strip()
+    if data["institution_links"]:
+        for t in data["institution_links"]:
+            t = _LEADING_INDEX_RE.sub('', t).strip()
             if t:
-                t = re.sub(r'^\d+\.', '', t).strip()
-                if t:
-                    paper["institutions"].append(t)
+                paper["institutions"].append(t)
     else:
         # Older papers: plain text institutions
-        inst_h3s = await page.query_selector_all('h3.author:not(#authorpart)')
-        for h3 in inst_h3s:
-            t = (await h3.inner_text()).strip()
-            if t:
-                # Split by comma, strip postal codes (6-digit numbers)
-                insts = re.split(r'[,，;；]', t)
-                for inst in insts:
-                    inst = re.sub(r'^\d+\.', '', inst).strip()
-                    inst = re.sub(r'\s*\d{6}\s*$', '', inst).strip()
-                    if inst and inst not in paper["institutions"]:
-                        paper["institutions"].append(inst)
+        for t in data["institution_text"]:
+            # Split by comma, strip postal codes (6-digit numbers)
+            insts = _LIST_SEP_RE.split(t)
+            for inst in insts:
+                inst = _LEADING_INDEX_RE.sub('', inst).strip()
+                inst = _POSTCODE_RE.sub('', inst).strip()
+                if inst and inst not in paper["institutions"]:
+                    paper["institutions"].append(inst)
 
-    paper["abstract"] = await text('#ChDivSummary')
-    paper["abstract_en"] = await text('#EnChDivSummary')
-
-    kw_els = await page.query_selector_all('p.keywords a')
-    paper["keywords"] = [(await k.inner_text()).strip().rstrip(';；') for k in kw_els
-                         if (await k.inner_text()).strip()]
+    paper["keywords"] = [k.rstrip(';；') for k in data["keywords"]]
 
     # Source (journal name): first link in top-tip pointing to navi.cnki.net
-    paper["source"] = await text('div.top-tip a[href*="navi.cnki.net"]')
-    paper["source"] = paper["source"].rstrip(' .')
+    paper["source"] = data["source"].rstrip(' .')
 
     # Year/Volume/Issue: parse from top-tip links
-    # Format examples: "2026 (02)", "2024,40(05):1-15", "2024,40(05)"
-    top_tip_links = await page.query_selector_all('div.top-tip a')
-    for link in top_tip_links:
-        link_text = (await link.inner_text()).strip()
-        # Look for patterns like "2024,40(05):1-15" or "2026 (02)" or "2024 ,40 (05) :1-15"
-        # Normalize whitespace
-        normalized = re.sub(r'\s+', '', link_text)
-        # Pattern: YYYY or YYYY,VOL(ISSUE):PAGES
-        m = re.match(r'^(\d{4})(?:,(\d+))?\((\d+)\)(?::(.+))?$', normalized)
+    for link_text in data["top_tip"]:
+        m = _INFO_RE.match(link_text)
         if m:
-            paper["year"] = m.group(1)
-            if m.group(2):
-                paper["volume"] = m.group(2)
-            paper["issue"] = m.group(3)
-            if m.group(4):
-                paper["pages"] = m.group(4)
+            paper["year"] = m["year"]
+            if m["volume"]:
+                paper["volume"] = m["volume"]
+            paper["issue"] = m["issue"]
+            if m["pages"]:
+                paper["pages"] = "".join(m["pages"].split())
             break
 
     # Pages: also check for "页码：X-Y" spans if not found above
     if not paper["pages"]:
-        all_spans = await page.query_selector_all('.doc span')
-        for span in all_spans:
-            t = (await span.inner_text()).strip()
+        for t in data["doc_spans"]:
             if t.startswith('页码：'):
                 paper["pages"] = t.replace('页码：', '').strip()
                 break
 
-    paper["doi"] = await text('li.top-space:has-text("DOI") p')
-    paper["cited_count"] = await text('#refs a') or await text('div.total-inform span:has-text("被引") + em')
-    paper["download_count"] = await text('#DownLoadParts a') or await text('div.total-inform span:has-text("下载") + em')
-    paper["fund"] = await text('li.top-space:has-text("基金") p') or await text('p.funds span')
-    paper["classification"] = await text('li:has-text("分类号") p')
-
     return paper
 
 
@@ -571,10 +1049,10 @@ async def _get_cnki_bibtex(page: Page, url: str) -> dict:
     page → click BibTex → extract content.
     """
     # Establish session
-    await page.goto("https://www.cnki.net/")
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
     await random_delay(1, 2)
     await page.set_extra_http_headers({"Referer": "https://kns.cnki.net/kns8s/AdvSearch"})
-    await page.goto(url)
+    await page.goto(url, wait_until="domcontentloaded")
     await random_delay(1.5, 2.5)
 
     # Click 引用 button to open citation popup
@@ -593,7 +1071,7 @@ async def _get_cnki_bibtex(page: Page, url: str) -> dict:
         return {"isError": True, "error": "导出链接为空"}
 
     # Navigate the same page to export URL
-    await page.goto(export_url)
+    await page.goto(export_url, wait_until="domcontentloaded")
     await page.wait_for_load_state('networkidle')
     await random_delay(1.5, 2.5)
 
@@ -646,10 +1124,10 @@ def _enrich_bibtex(bibtex_raw: str, paper: dict) -> str:
 async def _download_paper_pdf(page: Page, url: str, save_dir: str) -> dict:
     """Navigate to a CNKI paper detail page and download the PDF."""
     # Establish session and navigate to paper page
-    await page.goto("https://www.cnki.net/")
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
     await random_delay(1, 2)
     await page.set_extra_http_headers({"Referer": "https://kns.cnki.net/kns8s/AdvSearch"})
-    await page.goto(url)
+    await page.goto(url, wait_until="domcontentloaded")
     await random_delay(1.5, 2.5)
 
     # Find PDF download button
@@ -680,14 +1158,21 @@ async def _download_paper_pdf(page: Page, url: str, save_dir: str) -> dict:
 @dataclass
 class AppContext:
     browser_pool: BrowserPool
+    http: aiohttp.ClientSession
 
 
 @asynccontextmanager
 async def lifespan(server: FastMCP):
     pool = BrowserPool()
+    http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={"User-Agent": random.choice(USER_AGENTS)},
+    )
     try:
-        yield AppContext(browser_pool=pool)
+        yield AppContext(browser_pool=pool, http=http)
     finally:
+        await http.close()
         await pool.close()
 
 
@@ -712,10 +1197,15 @@ mcp = FastMCP(
     - journal: 限定期刊名称（可选）
     - pages: 页数（1-10）
     - sort: 排序（相关度/发表时间/被引/下载/综合）
+    - force_refresh: 忽略缓存重新检索（可选，相同检索 30 分钟内默认复用结果）
+    返回 incomplete=true 表示部分结果页未能获取（如被 CNKI 限流），此类结果不会缓存。
 
     ### get_paper_detail
     获取论文详情。参数: paper（论文标签）
 
+    ### get_paper_details
+    并行获取多篇论文详情。参数: papers（论文标签列表，最多 20 个）
+
     ### get_paper_bibtex
     获取论文 BibTeX 引用。参数: paper（论文标签）
 
@@ -738,6 +1228,29 @@ def get_browser_pool(ctx: Context = CurrentContext()) -> BrowserPool:
     return ctx.request_context.lifespan_context.browser_pool
 
 
+def get_http(ctx: Context = CurrentContext()) -> aiohttp.ClientSession:
+    return ctx.request_context.lifespan_context.http
+
+
+async def _fetch_paper_detail(browser_pool: BrowserPool, url: str, force_refresh: bool = False) -> dict:
+    """Paper detail for `url`, served from the result cache or a pooled page."""
+    cache_key = ("get_paper_detail", url)
+    if not force_refresh:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    page = await browser_pool.get_page()
+    try:
+        result = await _get_paper_detail(page, url)
+    finally:
+        await page.close()
+    # A page without a title did not render properly; don't pin that for the TTL
+    if result["title"]:
+        result_cache.put(cache_key, result)
+    return result
+
+
 @mcp.tool()
 async def search_cnki(
     query: Annotated[str, Field(description="搜索关键词（主题/篇名等，不要把作者名放在这里，请用 author 参数）。多个关键词用空格分隔，会自动用 AND 连接，如'北京 奥运'→SU='北京' * '奥运'", min_length=1)],
@@ -755,7 +1268,9 @@ async def search_cnki(
     sort: Annotated[str, Field(
         description="排序: 相关度/发表时间/被引/下载/综合 (英文: relevance/date/cited/download/composite)"
     )] = "相关度",
+    force_refresh: Annotated[bool, Field(description="忽略缓存重新检索（默认复用 30 分钟内相同检索的结果）")] = False,
     browser_pool: BrowserPool = Depends(get_browser_pool),
+    http: aiohttp.ClientSession = Depends(get_http),
 ) -> dict:
     """搜索 CNKI 论文，返回论文列表。支持通过 author 和 journal 参数分别筛选作者和期刊。
 
@@ -763,25 +1278,46 @@ async def search_cnki(
     如需按作者搜索，请使用 author 参数。author 和 query 可组合使用。
     示例：搜索张三关于经济增长的论文 → query='经济增长', author='张三'
     """
+    cache_key = (
+        "search_cnki", normalize_query(query), resolve_search_type(search_type),
+        normalize_query(author), normalize_query(journal), resolve_sort_type(sort), pages,
+    )
+    if not force_refresh:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            await ctx.info(f"命中缓存: 找到 {cached.get('total_papers', 0)} 篇论文")
+            return cached
+
     await ctx.info(f"搜索 CNKI: query='{query}', author={author}, journal={journal}")
     await ctx.report_progress(progress=0, total=100)
 
-    page = await browser_pool.get_page()
+    page = None
     try:
         if journal or author:
-            result = await _professional_search(page, query, search_type, journal, sort, pages, author=author)
+            page = await browser_pool.get_page()
+            result = await _professional_search(page, http, query, search_type, journal, sort, pages, author=author)
         else:
-            result = await _simple_search(page, query, search_type, sort, pages)
+            try:
+                result = await _simple_search_http(http, query, search_type, sort, pages)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                result = None
+            if result is None:
+                # Grid endpoint refused us (captcha / JS check); drive the real page instead
+                await ctx.info("HTTP 检索未返回结果表，改用浏览器检索")
+                page = await browser_pool.get_page()
+                result = await _simple_search(page, http, query, search_type, sort, pages)
     except Exception as e:
         result = {"isError": True, "error": str(e), "papers": []}
     finally:
-        await page.close()
+        if page is not None:
+            await page.close()
 
     await ctx.report_progress(progress=100, total=100)
     if result.get("isError"):
         await ctx.error(f"搜索失败: {result.get('error')}")
     else:
         await ctx.info(f"找到 {result.get('total_papers', 0)} 篇论文")
+        result_cache.put(cache_key, result)
     return result
 
 
@@ -789,6 +1325,7 @@ async def search_cnki(
 async def get_paper_detail(
     paper: Annotated[str, Field(description="论文标签（从 search_cnki 返回的 label 字段）")],
     ctx: Context,
+    force_refresh: Annotated[bool, Field(description="忽略缓存重新抓取详情页")] = False,
     browser_pool: BrowserPool = Depends(get_browser_pool),
 ) -> dict:
     """获取 CNKI 论文详情页的完整信息。"""
@@ -800,19 +1337,59 @@ async def get_paper_detail(
     await ctx.info(f"获取论文详情: {paper}")
     await ctx.report_progress(progress=0, total=100)
 
-    page = await browser_pool.get_page()
     try:
-        result = await _get_paper_detail(page, url)
+        result = await _fetch_paper_detail(browser_pool, url, force_refresh)
     except Exception as e:
         result = {"isError": True, "error": str(e), "paper": paper}
-    finally:
-        await page.close()
 
     result["paper"] = paper
     await ctx.report_progress(progress=100, total=100)
     return result
 
 
+@mcp.tool()
+async def get_paper_details(
+    papers: Annotated[List[str], Field(description="论文标签列表（从 search_cnki 返回的 label 字段）", min_length=1, max_length=20)],
+    ctx: Context,
+    force_refresh: Annotated[bool, Field(description="忽略缓存重新抓取详情页")] = False,
+    browser_pool: BrowserPool = Depends(get_browser_pool),
+) -> dict:
+    """批量获取多篇 CNKI 论文详情。各论文并行抓取，并发数受浏览器上下文池大小限制。"""
+    await ctx.info(f"批量获取论文详情: {len(papers)} 篇")
+    await ctx.report_progress(progress=0, total=100)
+
+    urls, errors = {}, {}  # label → URL / resolve error
+    for label in papers:
+        try:
+            urls[label] = paper_registry.resolve(label)
+        except KeyError as e:
+            errors[label] = str(e)
+
+    async def one(url: str) -> dict:
+        try:
+            return await _fetch_paper_detail(browser_pool, url, force_refresh)
+        except Exception as e:
+            return {"isError": True, "error": str(e)}
+
+    # Scrape each distinct URL once; get_page blocks once every pooled context
+    # is busy, so this fans out at most max_contexts wide
+    unique_urls = list(dict.fromkeys(urls.values()))
+    details = dict(zip(unique_urls, await asyncio.gather(*(one(u) for u in unique_urls))))
+
+    results = []
+    for label in papers:
+        if label in errors:
+            results.append({"isError": True, "error": errors[label], "paper": label})
+        else:
+            results.append({**details[urls[label]], "paper": label})
+
+    failed = sum(1 for r in results if r.get("isError"))
+    await ctx.report_progress(progress=100, total=100)
+    if failed:
+        await ctx.error(f"{failed} 篇论文详情获取失败")
+    return {"total": len(results), "failed": failed, "papers": results}
+
+
 @mcp.tool()
 async def download_paper_pdf(
     paper: Annotated[str, Field(description="论文标签（从 search_cnki 返回的 label 字段）")],
@@ -862,9 +1439,14 @@ async def get_paper_bibtex(
     await ctx.info(f"获取论文 BibTeX: {paper}")
     await ctx.report_progress(progress=0, total=100)
 
+    detail_key = ("get_paper_detail", url)
     page = await browser_pool.get_page()
     try:
-        paper_detail = await _get_paper_detail(page, url)
+        paper_detail = result_cache.get(detail_key)
+        if paper_detail is None:
+            paper_detail = await _get_paper_detail(page, url)
+            if paper_detail["title"]:
+                result_cache.put(detail_key, paper_detail)
         await ctx.report_progress(progress=40, total=100)
 
         bib_result = await _get_cnki_bibtex(page, url)
@@ -884,42 +1466,60 @@ async def get_paper_bibtex(
     return {"paper": paper, "bibtex": bibtex}
 
 
+async def _search_titles(page: Page, query: str) -> tuple[list, list]:
+    """Run a homepage search in the browser and return (titles, urls) of page 1."""
+    await page.goto("https://www.cnki.net/", wait_until="domcontentloaded")
+    await random_delay(1, 2)
+    await type_slowly(page, "#txt_SearchText", query)
+    await page.click(".search-btn")
+
+    titles, urls = [], []
+    try:
+        await page.wait_for_selector('a.fz14', timeout=15000)
+        links = page.locator('#gridTable a.fz14')
+        link_texts = await links.all_inner_texts()
+        hrefs = await links.evaluate_all('els => els.map(e => e.getAttribute("href") || "")')
+        for t, u in zip(link_texts, hrefs):
+            t = t.strip()
+            if t:
+                titles.append(t)
+                urls.append(u or "")
+    except Exception:
+        pass
+    return titles, urls
+
+
 @mcp.tool()
 async def find_best_match(
     query: Annotated[str, Field(description="论文标题", min_length=1)],
     ctx: Context,
     browser_pool: BrowserPool = Depends(get_browser_pool),
+    http: aiohttp.ClientSession = Depends(get_http),
 ) -> dict:
     """快速查找与输入标题最匹配的 CNKI 论文。"""
     await ctx.info(f"查找匹配: '{query[:50]}'")
     await ctx.report_progress(progress=0, total=100)
 
-    page = await browser_pool.get_page()
+    page = None
     try:
-        await page.goto("https://www.cnki.net/")
-        await random_delay(1, 2)
-        await type_slowly(page, "#txt_SearchText", query)
-        await page.click(".search-btn")
-        await random_delay(2, 3)
-
-        titles, urls = [], []
         try:
-            await page.wait_for_selector('a.fz14', timeout=15000)
-            links = await page.query_selector_all('#gridTable a.fz14')
-            for link in links:
-                t = (await link.inner_text()).strip()
-                u = await link.get_attribute("href")
-                if t:
-                    titles.append(t)
-                    urls.append(u or "")
-        except Exception:
-            pass
+            found = await _simple_search_http(http, query, "主题", "相关度", 1)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            found = None
+        if found is not None:
+            titles = [p["title"] for p in found["papers"]]
+            labels = [p["label"] for p in found["papers"]]
+        else:
+            await ctx.info("HTTP 检索未返回结果表，改用浏览器检索")
+            page = await browser_pool.get_page()
+            titles, urls = await _search_titles(page, query)
+            labels = None
 
         if not titles:
             result = {"query": query, "best_match": None, "message": "未找到结果"}
         else:
             idx = find_closest_title(query, titles)
-            label = paper_registry.register(urls[idx], "", "", titles[idx])
+            label = labels[idx] if labels is not None else paper_registry.register(urls[idx], "", "", titles[idx])
             result = {
                 "query": query,
                 "best_match": {"title": titles[idx], "label": label},
@@ -928,33 +1528,48 @@ async def find_best_match(
     except Exception as e:
         result = {"isError": True, "error": str(e)}
     finally:
-        await page.close()
+        if page is not None:
+            await page.close()
 
     await ctx.report_progress(progress=100, total=100)
     return result
 
 
+# Resource payloads are static, so serialize them once at import
+_SEARCH_TYPES_JSON = orjson.dumps({
+    "chinese_types": list(SEARCH_TYPES.keys()),
+    "english_aliases": list(SEARCH_TYPE_ALIASES.keys()),
+    "default": "主题",
+}, option=orjson.OPT_INDENT_2).decode()
+
+_SERVER_STATUS_JSON = orjson.dumps({
+    "server_name": "CNKI 论文检索服务",
+    "version": "0.1.0",
+    "backend": "aiohttp + lxml, Playwright (async) fallback",
+    "tools": ["search_cnki", "get_paper_detail", "get_paper_details", "get_paper_bibtex", "download_paper_pdf", "find_best_match"],
+    "features": ["http_simple_search", "journal_filter_via_professional_search", "bibtex_export", "pdf_download", "browser_pool", "idle_timeout", "result_cache"],
+}, option=orjson.OPT_INDENT_2).decode()
+
+
 @mcp.resource("cnki://search-types")
 async def get_search_types(ctx: Context) -> str:
-    return json.dumps({
-        "chinese_types": list(SEARCH_TYPES.keys()),
-        "english_aliases": list(SEARCH_TYPE_ALIASES.keys()),
-        "default": "主题",
-    }, ensure_ascii=False, indent=2)
+    return _SEARCH_TYPES_JSON
 
 
 @mcp.resource("cnki://status")
 async def get_server_status(ctx: Context) -> str:
-    return json.dumps({
-        "server_name": "CNKI 论文检索服务",
-        "version": "0.1.0",
-        "backend": "Playwright (async)",
-        "tools": ["search_cnki", "get_paper_detail", "get_paper_bibtex", "download_paper_pdf", "find_best_match"],
-        "features": ["journal_filter_via_professional_search", "bibtex_export", "pdf_download", "browser_pool", "idle_timeout"],
-    }, ensure_ascii=False, indent=2)
+    return _SERVER_STATUS_JSON
 
 
 def main():
+    # uvloop is an optional extra (pip install cnki-mcp[fast]); not available on Windows
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            uvloop.install()
     mcp.run()
 
 